@@ -0,0 +1,116 @@
+import json
+import time
+import argparse
+import pandas as pd
+from utils import percentile
+from run_opus_mt_th_en import ThToEnTranslator, DEFAULT_LENGTH_BUCKETS
+
+
+def benchmark(translator: ThToEnTranslator, texts: list[str], batch_size: int):
+    """Translate `texts` in batches and return predictions and per-sample times."""
+    predictions, times = [], []
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i : i + batch_size]
+        t1 = time.perf_counter()
+        outputs = translator(batch, batch_size=batch_size)
+        t2 = time.perf_counter()
+        predictions.extend([outputs] if isinstance(outputs, str) else outputs)
+        times.extend([(t2 - t1) / len(batch)] * len(batch))
+    return predictions, times
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare eager and compiled opus-mt-th-en inference."
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="dataset/evaluation.json",
+        help="Path to input JSON file",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default="Helsinki-NLP/opus-mt-th-en",
+        help="Marian model name or path",
+    )
+    parser.add_argument(
+        "--batch_size", type=int, default=1, help="Batch size for translation"
+    )
+    parser.add_argument(
+        "--buckets",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_LENGTH_BUCKETS),
+        help="Sequence length buckets for the compiled mode",
+    )
+    parser.add_argument(
+        "--max_new_tokens",
+        type=int,
+        default=256,
+        help="Generation limit applied to both modes",
+    )
+    parser.add_argument(
+        "--device", type=str, default="cpu", help="Device to run the model on"
+    )
+    parser.add_argument(
+        "--output", type=str, help="Optional path to save the report as JSON"
+    )
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        texts = [sample["thai"] for sample in json.load(f)]
+
+    stats, predictions = [], {}
+    for mode in ["eager", "compiled"]:
+        print(f"\n🔄 Loading {mode} translator")
+        t1 = time.perf_counter()
+        translator = ThToEnTranslator(
+            args.model,
+            compiled=mode == "compiled",
+            length_buckets=tuple(args.buckets),
+            batch_size=args.batch_size,
+            max_new_tokens=args.max_new_tokens,
+            device=args.device,
+        )
+        setup_time = time.perf_counter() - t1
+
+        predictions[mode], times = benchmark(translator, texts, args.batch_size)
+        stats.append(
+            {
+                "Mode": mode,
+                "Compiled": translator.compiled,
+                "Samples": len(times),
+                "Setup/Warmup (s)": round(setup_time, 3),
+                "Avg Time (s)": round(sum(times) / len(times), 4),
+                "p50 (s)": round(percentile(times, 50), 4),
+                "p90 (s)": round(percentile(times, 90), 4),
+            }
+        )
+
+    eager_time = stats[0]["Avg Time (s)"]
+    for row in stats:
+        row["Speedup"] = round(eager_time / row["Avg Time (s)"], 2)
+    matches = sum(
+        e == c for e, c in zip(predictions["eager"], predictions["compiled"])
+    )
+
+    df = pd.DataFrame(stats)
+    print("\n# ⚡ opus-mt-th-en: eager vs compiled\n")
+    print(df.to_markdown(index=False))
+    print(f"\nIdentical predictions: {matches}/{len(texts)}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"stats": stats, "identical_predictions": matches},
+                f,
+                ensure_ascii=False,
+                indent=4,
+            )
+        print(f"\n✅ Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
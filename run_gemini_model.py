@@ -2,15 +2,22 @@ import os
 import json
 import time
 import argparse
+from typing import Optional
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 
 
 # Load .env and initialize Gemini client
-def setup_gemini_client() -> genai.Client:
+def setup_gemini_client(base_url: Optional[str] = None) -> genai.Client:
     load_dotenv()
     api_key = os.getenv("GOOGLE_API_KEY")
+    if base_url:
+        # Local stand-in (see run_mock_server.py) does not check the key
+        return genai.Client(
+            api_key=api_key or "mock",
+            http_options=types.HttpOptions(base_url=base_url),
+        )
     if not api_key:
         raise EnvironmentError("GOOGLE_API_KEY is not set in environment.")
     return genai.Client(api_key=api_key)
@@ -105,10 +112,15 @@ def main():
         default="gemini-2.5-pro",
         help="Gemini model to use",
     )
+    parser.add_argument(
+        "--base_url",
+        type=str,
+        help="Override the Gemini API base URL (e.g. http://localhost:1234 for the mock server)",
+    )
 
     args = parser.parse_args()
 
-    client = setup_gemini_client()
+    client = setup_gemini_client(args.base_url)
 
     with open(args.input, "r", encoding="utf-8") as f:
         data = json.load(f)
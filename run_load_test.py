@@ -0,0 +1,277 @@
+import json
+import time
+import random
+import argparse
+import threading
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import pandas as pd
+from run_serving_llm import SYSTEM_PROMPT, USER_PROMPT_TEMPLATE
+from utils import percentile
+
+
+# ========== Request Builders ==========
+def build_request(
+    backend: str, base_url: str, model: str, text: str, stream: bool
+) -> tuple[str, dict, dict]:
+    """Return (url, headers, payload) for one translation request."""
+    user_prompt = USER_PROMPT_TEMPLATE.format(thai_query=text)
+    base_url = base_url.rstrip("/")
+
+    if backend == "openai":
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": 0.0,
+            "max_tokens": 1000,
+            "stream": stream,
+        }
+        return f"{base_url}/v1/chat/completions", {}, payload
+
+    method = "streamGenerateContent?alt=sse" if stream else "generateContent"
+    payload = {
+        "contents": [
+            {"role": "user", "parts": [{"text": SYSTEM_PROMPT}, {"text": user_prompt}]}
+        ]
+    }
+    headers = {"x-goog-api-key": "mock"}
+    return f"{base_url}/v1beta/models/{model}:{method}", headers, payload
+
+
+def send_request(
+    session: requests.Session,
+    url: str,
+    headers: dict,
+    payload: dict,
+    stream: bool,
+    timeout: float,
+) -> dict:
+    """Send one request and return its status, latency and time to first token."""
+    t_start = time.perf_counter()
+    ttft = None
+    try:
+        response = session.post(
+            url, json=payload, headers=headers, stream=stream, timeout=timeout
+        )
+        if stream and response.status_code == 200:
+            for line in response.iter_lines():
+                if line.startswith(b"data:") and ttft is None:
+                    ttft = time.perf_counter() - t_start
+        else:
+            response.content  # read the full body
+        status = response.status_code
+    except requests.RequestException:
+        status = None
+    latency = time.perf_counter() - t_start
+    return {"status": status, "latency": latency, "ttft": ttft}
+
+
+# ========== Load Patterns ==========
+def run_closed_loop(
+    texts: list[str], concurrency: int, num_requests: int, make_request
+) -> tuple[list[dict], float]:
+    """`concurrency` workers each issue the next request as soon as the previous one ends."""
+    results = []
+    lock = threading.Lock()
+    counter = iter(range(num_requests))
+
+    def worker():
+        session = requests.Session()
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            result = make_request(session, texts[i % len(texts)])
+            with lock:
+                results.append(result)
+
+    t_start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - t_start
+
+
+def run_open_loop(
+    texts: list[str],
+    qps: float,
+    num_requests: int,
+    make_request,
+    max_inflight: int,
+    poisson: bool,
+    rng: random.Random,
+) -> tuple[list[dict], float]:
+    """
+    Issue requests on a fixed arrival schedule regardless of completions.
+    Latency is measured from the scheduled arrival time, so time spent waiting
+    for a free client thread is counted (no coordinated omission).
+    """
+    arrivals = []
+    t = 0.0
+    for _ in range(num_requests):
+        arrivals.append(t)
+        t += rng.expovariate(qps) if poisson else 1.0 / qps
+
+    local = threading.local()
+
+    def task(text: str, scheduled: float) -> dict:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        queued = time.perf_counter() - scheduled
+        result = make_request(local.session, text)
+        result["latency"] += queued
+        if result["ttft"] is not None:
+            result["ttft"] += queued
+        return result
+
+    futures = []
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_inflight) as executor:
+        for i, offset in enumerate(arrivals):
+            delay = t_start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(
+                executor.submit(task, texts[i % len(texts)], t_start + offset)
+            )
+        results = [future.result() for future in futures]
+    return results, time.perf_counter() - t_start
+
+
+# ========== Reporting ==========
+def summarize(label: str, results: list[dict], elapsed: float) -> dict:
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    ttfts = [r["ttft"] for r in ok if r["ttft"] is not None]
+
+    def fmt(value: Optional[float]) -> Optional[float]:
+        return round(value, 4) if value is not None else None
+
+    return {
+        "Offered Load": label,
+        "Requests": len(results),
+        "OK": len(ok),
+        "429": sum(r["status"] == 429 for r in results),
+        "Errors": sum(r["status"] not in (200, 429) for r in results),
+        "Throughput (req/s)": fmt(len(ok) / elapsed if elapsed else 0.0),
+        "p50 (s)": fmt(percentile(latencies, 50)),
+        "p90 (s)": fmt(percentile(latencies, 90)),
+        "p99 (s)": fmt(percentile(latencies, 99)),
+        "TTFT p50 (s)": fmt(percentile(ttfts, 50)),
+    }
+
+
+# ========== Main Execution ==========
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load generator for the OpenAI-compatible and Gemini backends"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["openai", "gemini"],
+        default="openai",
+        help="API flavour of the backend",
+    )
+    parser.add_argument(
+        "--base_url",
+        type=str,
+        default="http://localhost:1234",
+        help="Backend base URL (real server or run_mock_server.py)",
+    )
+    parser.add_argument(
+        "--model", type=str, default="gemma-3-4b-it", help="Model name"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="dataset/evaluation.json",
+        help="Path to input JSON file with Thai queries",
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument(
+        "--qps",
+        type=float,
+        nargs="+",
+        help="Open-loop target request rates to sweep",
+    )
+    load.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        help="Closed-loop concurrency levels to sweep (default: 1 2 4 8)",
+    )
+    parser.add_argument(
+        "--num_requests", type=int, default=100, help="Requests per load level"
+    )
+    parser.add_argument(
+        "--max_inflight",
+        type=int,
+        default=64,
+        help="Client thread limit in open-loop mode",
+    )
+    parser.add_argument(
+        "--uniform_arrivals",
+        action="store_true",
+        help="Use evenly spaced instead of Poisson arrivals in open-loop mode",
+    )
+    parser.add_argument("--stream", action="store_true", help="Use streaming responses")
+    parser.add_argument(
+        "--timeout", type=float, default=60.0, help="Per-request timeout in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--output", type=str, help="Optional path to save the report as JSON"
+    )
+    args = parser.parse_args()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        texts = [sample["thai"] for sample in json.load(f)]
+
+    def make_request(session: requests.Session, text: str) -> dict:
+        url, headers, payload = build_request(
+            args.backend, args.base_url, args.model, text, args.stream
+        )
+        return send_request(session, url, headers, payload, args.stream, args.timeout)
+
+    rng = random.Random(args.seed)
+    stats = []
+    if args.qps:
+        for qps in args.qps:
+            print(f"\n🚀 Open loop at {qps} req/s ({args.num_requests} requests)")
+            results, elapsed = run_open_loop(
+                texts,
+                qps,
+                args.num_requests,
+                make_request,
+                max_inflight=args.max_inflight,
+                poisson=not args.uniform_arrivals,
+                rng=rng,
+            )
+            stats.append(summarize(f"{qps} req/s", results, elapsed))
+    else:
+        for concurrency in args.concurrency or [1, 2, 4, 8]:
+            print(f"\n🚀 Closed loop with {concurrency} concurrent clients")
+            results, elapsed = run_closed_loop(
+                texts, concurrency, args.num_requests, make_request
+            )
+            stats.append(summarize(f"{concurrency} clients", results, elapsed))
+
+    df = pd.DataFrame(stats)
+    print("\n# 📈 Latency vs Offered Load\n")
+    print(df.to_markdown(index=False))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=4)
+        print(f"\n✅ Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+
+# ========== Latency Model ==========
+class LatencyModel:
+    """Sample request/token latencies (in seconds) from a configurable distribution."""
+
+    DISTRIBUTIONS = ["constant", "uniform", "normal", "lognormal", "exponential"]
+
+    def __init__(
+        self,
+        distribution: str = "constant",
+        mean: float = 0.3,
+        std: float = 0.1,
+        per_token: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.mean = mean
+        self.std = std
+        self.per_token = per_token
+        self.rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.distribution == "constant":
+            value = self.mean
+        elif self.distribution == "uniform":
+            value = self.rng.uniform(self.mean - self.std, self.mean + self.std)
+        elif self.distribution == "normal":
+            value = self.rng.gauss(self.mean, self.std)
+        elif self.distribution == "lognormal":
+            # Parameterised so that the samples have the requested mean and std
+            variance = max(self.std, 1e-9) ** 2
+            sigma2 = math.log1p(variance / max(self.mean, 1e-9) ** 2)
+            mu = math.log(max(self.mean, 1e-9)) - sigma2 / 2
+            value = self.rng.lognormvariate(mu, sigma2**0.5)
+        else:
+            value = self.rng.expovariate(1.0 / max(self.mean, 1e-9))
+        return max(value, 0.0)
+
+
+# ========== Mock Backend ==========
+class MockBackend:
+    """
+    Shared state of the stand-in server: latency model, slot limit and 429 injection.
+    Replies with the reference translation when the Thai query is found in the
+    dataset, otherwise with a deterministic placeholder.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyModel,
+        slots: int = 1,
+        error_rate: float = 0.0,
+        reject_when_busy: bool = False,
+        retry_after: int = 1,
+        dataset_path: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.slots = slots
+        self.error_rate = error_rate
+        self.reject_when_busy = reject_when_busy
+        self.retry_after = retry_after
+        self.semaphore = asyncio.Semaphore(slots)
+        self.active = 0
+        self.admitted = 0
+        self.references = {}
+        if dataset_path:
+            with open(dataset_path, "r", encoding="utf-8") as f:
+                items = [
+                    item for item in json.load(f) if "thai" in item and "english" in item
+                ]
+            # Longest queries first so a short query never shadows a longer one
+            items.sort(key=lambda item: len(item["thai"]), reverse=True)
+            self.references = {item["thai"]: item["english"] for item in items}
+
+    def reply_for(self, prompt: str) -> str:
+        for thai, english in self.references.items():
+            if thai in prompt:
+                return english
+        return f"[MOCK] translation of {len(prompt)} characters"
+
+    def admit(self) -> bool:
+        """
+        Reserve a slot for a request in the handler, before any streaming starts.
+        Admitted requests (running or queued) are released in `generate`.
+        """
+        if self.error_rate > 0 and self.latency.rng.random() < self.error_rate:
+            return False
+        if self.reject_when_busy and self.admitted >= self.slots:
+            return False
+        self.admitted += 1
+        return True
+
+    def rate_limited(self, body: dict) -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content=body,
+            headers={"Retry-After": str(int(self.retry_after))},
+        )
+
+    async def generate(self, prompt: str):
+        """
+        Hold a slot for the sampled latency and yield the reply word by word.
+        Must only be called for requests that passed `admit`.
+        """
+        try:
+            async with self.semaphore:
+                self.active += 1
+                try:
+                    await asyncio.sleep(self.latency.sample())
+                    words = self.reply_for(prompt).split(" ")
+                    for i, word in enumerate(words):
+                        if self.latency.per_token > 0:
+                            await asyncio.sleep(self.latency.per_token)
+                        yield word if i == 0 else " " + word
+                finally:
+                    self.active -= 1
+        finally:
+            self.admitted -= 1
+
+
+def create_app(backend: MockBackend) -> FastAPI:
+    app = FastAPI(title="Mock translation backend")
+
+    def sse(payload: dict) -> str:
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    # ---------- OpenAI-compatible chat completions ----------
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if not backend.admit():
+            return backend.rate_limited(
+                {"error": {"message": "Rate limit exceeded", "type": "rate_limit"}}
+            )
+
+        model = body.get("model", "mock")
+        prompt = "\n".join(
+            str(m.get("content", "")) for m in body.get("messages", [])
+        )
+        completion_id = f"chatcmpl-mock-{int(time.time() * 1000)}"
+
+        if body.get("stream"):
+
+            async def stream():
+                async for piece in backend.generate(prompt):
+                    yield sse(
+                        {
+                            "id": completion_id,
+                            "object": "chat.completion.chunk",
+                            "model": model,
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "delta": {"role": "assistant", "content": piece},
+                                    "finish_reason": None,
+                                }
+                            ],
+                        }
+                    )
+                yield sse(
+                    {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                    }
+                )
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(stream(), media_type="text/event-stream")
+
+        content = "".join([piece async for piece in backend.generate(prompt)])
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(content.split()),
+                "total_tokens": len(prompt.split()) + len(content.split()),
+            },
+        }
+
+    # ---------- Gemini generateContent ----------
+    def gemini_prompt(body: dict) -> str:
+        return "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+
+    def gemini_chunk(model: str, text: str, finish_reason: Optional[str]) -> dict:
+        candidate = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+        if finish_reason:
+            candidate["finishReason"] = finish_reason
+        return {"candidates": [candidate], "modelVersion": model}
+
+    def gemini_rate_limited() -> JSONResponse:
+        return backend.rate_limited(
+            {
+                "error": {
+                    "code": 429,
+                    "message": "Resource has been exhausted (e.g. check quota).",
+                    "status": "RESOURCE_EXHAUSTED",
+                }
+            }
+        )
+
+    @app.post("/{version}/models/{model}:generateContent")
+    async def generate_content(version: str, model: str, request: Request):
+        body = await request.json()
+        if not backend.admit():
+            return gemini_rate_limited()
+
+        text = "".join(
+            [piece async for piece in backend.generate(gemini_prompt(body))]
+        )
+        return gemini_chunk(model, text, "STOP")
+
+    @app.post("/{version}/models/{model}:streamGenerateContent")
+    async def stream_generate_content(version: str, model: str, request: Request):
+        body = await request.json()
+        if not backend.admit():
+            return gemini_rate_limited()
+
+        async def stream():
+            async for piece in backend.generate(gemini_prompt(body)):
+                yield sse(gemini_chunk(model, piece, None))
+            yield sse(gemini_chunk(model, "", "STOP"))
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/health")
+    async def health():
+        return {
+            "status": "ok",
+            "slots": backend.slots,
+            "active": backend.active,
+            "admitted": backend.admitted,
+        }
+
+    return app
+
+
+# ========== Main Execution ==========
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline stand-in for the OpenAI-compatible and Gemini endpoints"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Bind host")
+    parser.add_argument("--port", type=int, default=1234, help="Bind port")
+    parser.add_argument(
+        "--latency",
+        choices=LatencyModel.DISTRIBUTIONS,
+        default="constant",
+        help="Request latency distribution",
+    )
+    parser.add_argument(
+        "--latency_mean", type=float, default=0.3, help="Mean latency in seconds"
+    )
+    parser.add_argument(
+        "--latency_std", type=float, default=0.1, help="Latency spread in seconds"
+    )
+    parser.add_argument(
+        "--token_latency",
+        type=float,
+        default=0.0,
+        help="Extra delay per generated word in seconds",
+    )
+    parser.add_argument(
+        "--slots",
+        type=int,
+        default=1,
+        help="Number of requests processed concurrently (like llama.cpp --parallel)",
+    )
+    parser.add_argument(
+        "--reject_when_busy",
+        action="store_true",
+        help="Return 429 instead of queueing when all slots are busy",
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="Probability of answering a request with 429",
+    )
+    parser.add_argument(
+        "--retry_after",
+        type=int,
+        default=1,
+        help="Retry-After header value (whole seconds) sent with 429 responses",
+    )
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        help="Optional JSON dataset used to answer with reference translations",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    latency = LatencyModel(
+        distribution=args.latency,
+        mean=args.latency_mean,
+        std=args.latency_std,
+        per_token=args.token_latency,
+        seed=args.seed,
+    )
+    backend = MockBackend(
+        latency,
+        slots=args.slots,
+        error_rate=args.error_rate,
+        reject_when_busy=args.reject_when_busy,
+        retry_after=args.retry_after,
+        dataset_path=args.dataset,
+    )
+
+    print(f"🧪 Mock backend listening on http://{args.host}:{args.port}")
+    uvicorn.run(create_app(backend), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
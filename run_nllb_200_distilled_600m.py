@@ -2,26 +2,131 @@ import json
 import time
 import torch
 import argparse
-from transformers import pipeline
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
 
+# NLLB (FLORES-200) language codes; Thai is written in Thai script
+SRC_LANG = "tha_Thai"
+TGT_LANG = "eng_Latn"
 
-def load_pipeline(model_name: str, dtype: torch.dtype = torch.bfloat16):
+
+def load_pipeline(
+    model_name: str, dtype: torch.dtype = torch.bfloat16, device: str = "cpu"
+):
     return pipeline(
         task="translation",
         model=model_name,
         torch_dtype=dtype,
+        device=device,
     )
 
 
 def th_to_en_translator(pipeline_func, text: str) -> str:
     result = pipeline_func(
         text,
-        src_lang="tha_Latn",
-        tgt_lang="eng_Latn",
+        src_lang=SRC_LANG,
+        tgt_lang=TGT_LANG,
     )
     return result[0]["translation_text"]
 
 
+class BatchedNllbTranslator:
+    """
+    Batched NLLB engine calling `model.generate` directly.
+    The source language and forced BOS token are set once; texts are tokenized
+    once, sorted by length and copied into preallocated padded buffers so each
+    batch only pads to its own longest sequence.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dtype: torch.dtype = torch.bfloat16,
+        batch_size: int = 16,
+        device: str = "cpu",
+    ):
+        self.device = device
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, src_lang=SRC_LANG)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(
+            model_name, torch_dtype=dtype
+        ).to(self.device)
+        self.model.eval()
+        self.forced_bos_token_id = self.tokenizer.convert_tokens_to_ids(TGT_LANG)
+        self.batch_size = batch_size
+
+    def __call__(self, texts: list[str]) -> tuple[list[str], list[float]]:
+        """Translate `texts`, returning predictions and amortized per-sample seconds."""
+        if not texts:
+            return [], []
+        try:
+            encoded = self.tokenizer(texts, truncation=True)["input_ids"]
+        except Exception as e:
+            return [f"[ERROR] {str(e)}"] * len(texts), [0.0] * len(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+
+        max_len = max(len(ids) for ids in encoded)
+        input_ids = torch.full(
+            (self.batch_size, max_len), self.tokenizer.pad_token_id, dtype=torch.long
+        )
+        attention_mask = torch.zeros((self.batch_size, max_len), dtype=torch.long)
+
+        predictions = [""] * len(texts)
+        times = [0.0] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            t1 = time.time()
+            batch = order[start : start + self.batch_size]
+            length = max(len(encoded[i]) for i in batch)
+            input_ids.fill_(self.tokenizer.pad_token_id)
+            attention_mask.zero_()
+            for row, i in enumerate(batch):
+                input_ids[row, : len(encoded[i])] = torch.tensor(encoded[i])
+                attention_mask[row, : len(encoded[i])] = 1
+
+            try:
+                with torch.inference_mode():
+                    outputs = self.model.generate(
+                        input_ids=input_ids[: len(batch), :length].to(self.device),
+                        attention_mask=attention_mask[: len(batch), :length].to(
+                            self.device
+                        ),
+                        forced_bos_token_id=self.forced_bos_token_id,
+                    )
+                decoded = self.tokenizer.batch_decode(
+                    outputs, skip_special_tokens=True
+                )
+            except Exception as e:
+                decoded = [f"[ERROR] {str(e)}"] * len(batch)
+            t2 = time.time()
+
+            for i, prediction in zip(batch, decoded):
+                predictions[i] = prediction
+                times[i] = (t2 - t1) / len(batch)
+        return predictions, times
+
+
+def single_shot(
+    model_name: str, data: list[dict], key: str = "time_second", device: str = "cpu"
+):
+    """Translate one sample at a time through the pipeline, storing the time under `key`."""
+    translator = load_pipeline(model_name, device=device)
+
+    for i, sample in enumerate(data):
+        print(f"\n🔄 Translating {i+1}/{len(data)}")
+        t1 = time.time()
+        try:
+            predict = th_to_en_translator(translator, sample["thai"])
+        except Exception as e:
+            predict = f"[ERROR] {str(e)}"
+        t2 = time.time()
+
+        if key == "time_second":
+            sample["predict"] = predict
+        sample[key] = round(t2 - t1, 3)
+
+        print(f"🇹🇭 Thai: {sample['thai']}")
+        print(f"🇬🇧 English: {predict}")
+        print(f"⏱ Time: {sample[key]}s")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Thai-to-English translation using NLLB"
@@ -38,30 +143,53 @@ def main():
         default="facebook/nllb-200-distilled-600M",
         help="Translation model name",
     )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="Batch size; values > 1 use the batched engine",
+    )
+    parser.add_argument(
+        "--compare_single",
+        action="store_true",
+        help="With --batch_size > 1, also time the single-shot pipeline",
+    )
+    parser.add_argument(
+        "--device",
+        type=str,
+        default="cpu",
+        help="Device to run the model on (e.g. cuda)",
+    )
     args = parser.parse_args()
 
-    # Load model pipeline
-    translator = load_pipeline(args.model)
-
     # Load input data
     with open(args.input, mode="r", encoding="utf-8") as f:
         data = json.load(f)
 
-    for i, sample in enumerate(data):
-        print(f"\n🔄 Translating {i+1}/{len(data)}")
-        t1 = time.time()
-        try:
-            predict = th_to_en_translator(translator, sample["thai"])
-        except Exception as e:
-            predict = f"[ERROR] {str(e)}"
-        t2 = time.time()
-
-        sample["predict"] = predict
-        sample["time_second"] = round(t2 - t1, 3)
+    if args.batch_size > 1:
+        engine = BatchedNllbTranslator(
+            args.model, batch_size=args.batch_size, device=args.device
+        )
+        predictions, times = engine([sample["thai"] for sample in data])
+        # Free the batched model before single_shot loads its own copy
+        del engine
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+        for sample, predict, t in zip(data, predictions, times):
+            sample["predict"] = predict
+            sample["time_second"] = round(t, 3)
+            print(f"🇹🇭 Thai: {sample['thai']}")
+            print(f"🇬🇧 English: {predict}")
+        if times:
+            print(f"\n⏱ Avg amortized time: {sum(times) / len(times):.4f}s/sample")
 
-        print(f"🇹🇭 Thai: {sample['thai']}")
-        print(f"🇬🇧 English: {predict}")
-        print(f"⏱ Time: {sample['time_second']}s")
+    if args.batch_size <= 1:
+        single_shot(args.model, data, device=args.device)
+    elif args.compare_single:
+        single_shot(args.model, data, key="time_second_single", device=args.device)
+        if data:
+            single_avg = sum(s["time_second_single"] for s in data) / len(data)
+            print(f"\n⏱ Avg single-shot time: {single_avg:.4f}s/sample")
 
     output_path = args.output or f"dataset/{args.model.split('/')[-1]}.json"
     with open(output_path, mode="w", encoding="utf-8") as f:
@@ -1,7 +1,14 @@
+import math
+import warnings
 from typing import Optional, Union, Generator
+import torch
+import torch.nn.functional as F
 from transformers import MarianMTModel, MarianTokenizer
 
 
+DEFAULT_LENGTH_BUCKETS = (16, 32, 64, 128)
+
+
 def chunks(lst: list, size: Optional[int] = None) -> Generator:
     """Yield successive chunks of a list."""
     if size is None or size <= 0:
@@ -12,12 +19,103 @@ def chunks(lst: list, size: Optional[int] = None) -> Generator:
 
 
 class ThToEnTranslator:
-    def __init__(self, model_name_or_path: str = "Helsinki-NLP/opus-mt-th-en"):
+    def __init__(
+        self,
+        model_name_or_path: str = "Helsinki-NLP/opus-mt-th-en",
+        compiled: bool = False,
+        length_buckets: tuple[int, ...] = DEFAULT_LENGTH_BUCKETS,
+        batch_size: int = 1,
+        max_new_tokens: Optional[int] = None,
+        device: str = "cpu",
+    ):
         self.tokenizer = MarianTokenizer.from_pretrained(model_name_or_path)
-        self.model = MarianMTModel.from_pretrained(model_name_or_path)
+        self.model = MarianMTModel.from_pretrained(model_name_or_path).to(device)
+        self.device = device
+        self.compiled = compiled
+        self.length_buckets = tuple(sorted(length_buckets))
+        self.batch_size = batch_size
+        # Compiled mode needs a fixed generation length to size the static cache;
+        # eager mode keeps the model's own generation_config unless told otherwise
+        if compiled and max_new_tokens is None:
+            max_new_tokens = 256
+        self.max_new_tokens = max_new_tokens
+        if compiled:
+            self._compile()
+
+    def _compile(self):
+        """
+        Compile the decoder step with a static KV cache and pre-warm every bucket.
+        Inputs are padded to (batch_size, bucket) so each bucket reuses one graph.
+        """
+        model = self.model
+        # Newer transformers releases replaced `_supports_static_cache` with
+        # `_can_compile_fullgraph`
+        if not (
+            getattr(model, "_can_compile_fullgraph", False)
+            or getattr(model, "_supports_static_cache", False)
+        ):
+            # Without a static cache the past-KV shape grows every step and the
+            # compiled graph would be rebuilt each time, so stay in eager mode.
+            warnings.warn(
+                f"{type(model).__name__} does not support a static KV cache in this "
+                "transformers version; falling back to eager generation."
+            )
+            self.compiled = False
+            return
+        model.generation_config.cache_implementation = "static"
+        model.forward = torch.compile(model.forward, mode="reduce-overhead")
+
+        warmup = self.tokenizer(["สวัสดีครับ"], return_tensors="pt")
+        for length in self.warmup_lengths():
+            inputs = self._pad_to_static_shape(warmup, length=length)
+            # CUDA graphs are recorded on the second call, so warm up twice
+            for _ in range(2):
+                self._generate(inputs)
+
+    def warmup_lengths(self) -> list[int]:
+        """Every padded length an input can reach, up to the tokenizer's truncation limit."""
+        max_length = self.bucket_length(self.tokenizer.model_max_length)
+        lengths = list(self.length_buckets)
+        while lengths[-1] < max_length:
+            lengths.append(lengths[-1] + self.length_buckets[-1])
+        return lengths
+
+    def bucket_length(self, length: int) -> int:
+        """Smallest bucket that fits `length`, or a multiple of the largest one."""
+        for bucket in self.length_buckets:
+            if length <= bucket:
+                return bucket
+        largest = self.length_buckets[-1]
+        return math.ceil(length / largest) * largest
+
+    def _pad_to_static_shape(self, inputs: dict, length: Optional[int] = None) -> dict:
+        input_ids, attention_mask = inputs["input_ids"], inputs["attention_mask"]
+        n_rows, n_cols = input_ids.shape
+
+        extra_cols = (length or self.bucket_length(n_cols)) - n_cols
+        input_ids = F.pad(input_ids, (0, extra_cols), value=self.tokenizer.pad_token_id)
+        attention_mask = F.pad(attention_mask, (0, extra_cols), value=0)
+
+        # Repeat the last row so the batch dimension is static as well
+        extra_rows = max(self.batch_size - n_rows, 0)
+        if extra_rows:
+            input_ids = torch.cat([input_ids, input_ids[-1:].repeat(extra_rows, 1)])
+            attention_mask = torch.cat(
+                [attention_mask, attention_mask[-1:].repeat(extra_rows, 1)]
+            )
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+    def _generate(self, inputs: dict) -> torch.Tensor:
+        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        # A fixed generation length keeps the static cache size (and graph) per bucket
+        kwargs = {}
+        if self.max_new_tokens is not None:
+            kwargs["max_new_tokens"] = self.max_new_tokens
+        with torch.inference_mode():
+            return self.model.generate(**inputs, **kwargs)
 
     def __call__(
-        self, texts: Union[str, list[str]], batch_size: int = 1
+        self, texts: Union[str, list[str]], batch_size: Optional[int] = None
     ) -> Union[str, list[str]]:
         """
         Translate Thai text(s) to English.
@@ -26,15 +124,26 @@ class ThToEnTranslator:
         """
         if isinstance(texts, str):
             texts = [texts]
+        batch_size = batch_size or self.batch_size
+        if self.compiled and batch_size > self.batch_size:
+            raise ValueError(
+                f"batch_size={batch_size} exceeds the compiled batch size "
+                f"{self.batch_size}; larger batches were never pre-warmed."
+            )
 
         translations = []
         for batch in chunks(texts, size=batch_size):
             inputs = self.tokenizer(
                 batch, return_tensors="pt", padding=True, truncation=True
             )
-            outputs = self.model.generate(**inputs)
+            if self.compiled:
+                inputs = self._pad_to_static_shape(inputs)
+            outputs = self._generate(inputs)
             translations.extend(
-                [self.tokenizer.decode(t, skip_special_tokens=True) for t in outputs]
+                [
+                    self.tokenizer.decode(t, skip_special_tokens=True)
+                    for t in outputs[: len(batch)]
+                ]
             )
         return translations if len(translations) > 1 else translations[0]
 
@@ -58,25 +167,43 @@ if __name__ == "__main__":
     parser.add_argument(
         "--batch_size", type=int, default=1, help="Batch size for translation"
     )
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="Use static-shape padding, static KV cache and torch.compile",
+    )
+    parser.add_argument(
+        "--device", type=str, default="cpu", help="Device to run the model on"
+    )
     args = parser.parse_args()
 
-    translator = ThToEnTranslator("Helsinki-NLP/opus-mt-th-en")
+    translator = ThToEnTranslator(
+        "Helsinki-NLP/opus-mt-th-en",
+        compiled=args.compile,
+        batch_size=args.batch_size,
+        device=args.device,
+    )
 
     with open(args.input, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    for i, sample in enumerate(data):
-        print(f"\n🔄 Translating {i+1}/{len(data)}")
+    # Translate the dataset in batches; time_second is the amortized per-sample time
+    for start in range(0, len(data), args.batch_size):
+        batch = data[start : start + args.batch_size]
+        print(f"\n🔄 Translating {start + 1}-{start + len(batch)}/{len(data)}")
         t1 = time.time()
-        prediction = translator(sample["thai"], batch_size=args.batch_size)
+        predictions = translator([sample["thai"] for sample in batch])
         t2 = time.time()
+        if isinstance(predictions, str):
+            predictions = [predictions]
 
-        sample["predict"] = prediction
-        sample["time_second"] = round(t2 - t1, 3)
+        for sample, prediction in zip(batch, predictions):
+            sample["predict"] = prediction
+            sample["time_second"] = round((t2 - t1) / len(batch), 3)
 
-        print(f"🇹🇭 Thai: {sample['thai']}")
-        print(f"🇬🇧 English: {prediction}")
-        print(f"⏱ Time: {sample['time_second']}s")
+            print(f"🇹🇭 Thai: {sample['thai']}")
+            print(f"🇬🇧 English: {prediction}")
+            print(f"⏱ Time: {sample['time_second']}s")
 
     with open(args.output, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=4)
@@ -82,6 +82,7 @@ def th_to_en_translator(
     temperature: float = 0.0,
     max_tokens: int = 1000,
     model_name: str = "gemma-3-4b-it",
+    api_url: str = LLAMA_API_URL,
 ) -> str:
     messages = [
         {"role": "system", "content": SYSTEM_PROMPT},
@@ -97,7 +98,7 @@ def th_to_en_translator(
     }
 
     try:
-        response = requests.post(LLAMA_API_URL, json=payload)
+        response = requests.post(api_url, json=payload)
         response.raise_for_status()
         parsed = CompletionResponse.parse_obj(response.json())
         return parsed.choices[0].message.content.strip()
@@ -128,6 +129,12 @@ def main():
         default="gemma-3-4b-it",
         help="Model name",
     )
+    parser.add_argument(
+        "--api_url",
+        type=str,
+        default=LLAMA_API_URL,
+        help="Chat completions endpoint (e.g. the mock server from run_mock_server.py)",
+    )
     args = parser.parse_args()
 
     output_path = args.output or f"dataset/{args.model}.json"
@@ -138,7 +145,9 @@ def main():
     for i, sample in enumerate(data):
         print(f"\n🔄 Translating {i + 1}/{len(data)}")
         t1 = time.time()
-        translation = th_to_en_translator(sample["thai"], model_name=args.model)
+        translation = th_to_en_translator(
+            sample["thai"], model_name=args.model, api_url=args.api_url
+        )
         t2 = time.time()
 
         sample["predict"] = translation
@@ -0,0 +1,11 @@
+import math
+from typing import Optional
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index]